@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-# app_pc.py — PC side: receive video (TCP:6000) -> YOLO -> send binary cmd to Pi (TCP:6001)
+# app_pc.py — PC side: receive video (TCP:6000, or UDP:6000 via network.video_transport) -> YOLO -> send binary cmd to Pi (TCP:6001)
 # Detect BOTH classes: bottle=0, leaf=1 → send state=1 for bottle, 2 for leaf
 # Reads configuration from config.yaml
 
@@ -11,6 +11,8 @@ import yaml
 # ---------- Import local modules ----------
 from ai_core.filters import Kalman1D
 from ai_core.postprocess import pick_best_target_fused
+from ioM.udp_video_source import UDPVideoSource
+from ioM.decision_log import DecisionLog, KIND_STALL, KIND_QUIT
 
 
 VIDEO_RECV_TIMEOUT_S = 10.0   # ยืดเวลาเผื่อเฟรมเว้นช่วง
@@ -131,6 +133,7 @@ def main():
     PI_HOST = CFG["network"]["pi_ip"]
     VIDEO_PORT = CFG["network"]["video_port"]
     CMD_PORT = CFG["network"]["cmd_port"]
+    VIDEO_TRANSPORT = CFG["network"].get("video_transport", "tcp")
 
     # --- YOLO Model ---
     from ultralytics import YOLO
@@ -173,7 +176,16 @@ def main():
     )
 
     # --- Socket connect ---
-    video_sock = connect_with_retry(PI_HOST, VIDEO_PORT, "video")
+    video_sock = None
+    video_src = None
+    if VIDEO_TRANSPORT == "udp":
+        video_src = UDPVideoSource(
+            CFG["network"].get("udp_bind_ip", "0.0.0.0"),
+            VIDEO_PORT,
+            frame_deadline_s=CFG["network"].get("udp_frame_deadline_ms", 100) / 1000.0
+        )
+    else:
+        video_sock = connect_with_retry(PI_HOST, VIDEO_PORT, "video")
     cmd_sock   = connect_with_retry(PI_HOST, CMD_PORT, "cmd")
 
     # --- Classes ---
@@ -181,15 +193,40 @@ def main():
     leaf_id   = CFG["classes"]["leaf"]
 
     SHOW_WINDOW = CFG["runtime"]["gui"]
+    PRINT_CMD = CFG["runtime"].get("print_cmd", True)
     PROCESS_EVERY_N = CFG["runtime"].get("process_every_n", 2)
     WINDOW_NAME = "Desktop AI View"
 
+    # --- Decision log (binary, per frame) ---
+    dlog = None
+    log_path = CFG["runtime"].get("decision_log", "")
+    if log_path:
+        dlog = DecisionLog(time.strftime(log_path), capacity=CFG["runtime"].get("decision_log_capacity", 4096))
+
     last_best = None
     frame_id = 0
 
     try:
         while True:
-            frame = recv_frame_tcp(video_sock)
+            if video_src is not None:
+                # UDP: เฟรมหาย/ไม่ครบ -> ข้ามไปเลย ไม่ต้องรีคอนเนคต์
+                frame = video_src.read()
+                if frame is None:
+                    # ไม่มีภาพ (read timeout) -> สั่งหยุดหุ่นไว้ก่อน และให้หน้าต่างยังรับปุ่มได้
+                    cmd_sock = send_bytes(cmd_sock, 0, 0, 0, PI_HOST, CMD_PORT, verbose=PRINT_CMD)
+                    if dlog is not None:
+                        # ไม่มีเฟรม -> ไม่ขยับ frame_id; src_fid = เฟรมล่าสุดที่ได้ก่อนค้าง
+                        t_now = time.time()
+                        last_fid = video_src.last_frame_id
+                        dlog.log(0, last_fid if last_fid is not None else 0, t_now, t_now, kind=KIND_STALL)
+                    last_best = None
+                    if SHOW_WINDOW and cv2.waitKey(1) & 0xFF == ord('q'):
+                        if dlog is not None:
+                            dlog.log(0, last_fid if last_fid is not None else 0, t_now, time.time(), kind=KIND_QUIT)
+                        break
+                    continue
+            else:
+                frame = recv_frame_tcp(video_sock)
             if frame is None:
                 print("[TCP] video lost, reconnecting ...")
                 try: video_sock.close()
@@ -198,6 +235,8 @@ def main():
                 continue
 
             frame_id += 1
+            t_recv = time.time()
+            src_fid = video_src.last_frame_id if video_src is not None else frame_id
             Hh, Ww = frame.shape[:2]
             cx = Ww // 2
             best = last_best
@@ -224,7 +263,9 @@ def main():
                 )
                 last_best = best
             if best is None:
-                cmd_sock = send_bytes(cmd_sock, 0, 0, 0, PI_HOST, CMD_PORT)
+                cmd_sock = send_bytes(cmd_sock, 0, 0, 0, PI_HOST, CMD_PORT, verbose=PRINT_CMD)
+                if dlog is not None:
+                    dlog.log(frame_id, src_fid, t_recv, time.time())
                 cv2.putText(frame, "NO TARGET", (10, 30),
                             cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,0,255), 2)
             else:
@@ -238,7 +279,11 @@ def main():
                 state_val = 1 if cls == bottle_id else 2
                 label = "bottle" if cls == bottle_id else "leaf"
 
-                cmd_sock = send_bytes(cmd_sock, speed_pct, int(round(angle_deg)), state_val, PI_HOST, CMD_PORT)
+                cmd_sock = send_bytes(cmd_sock, speed_pct, int(round(angle_deg)), state_val, PI_HOST, CMD_PORT, verbose=PRINT_CMD)
+                if dlog is not None:
+                    dlog.log(frame_id, src_fid, t_recv, time.time(), cls=cls, xyxy=best["xyxy"],
+                             dist_raw=best["distance_cm"], dist_filt=dist_cm, method=best["method"],
+                             angle=angle_deg, speed=speed_pct, state=state_val)
 
                 draw_box_and_centers(frame, cx, best)
                 overlay = f"{label}: {dist_cm:5.1f}cm {speed_pct}% {angle_deg:5.1f}°"
@@ -248,7 +293,10 @@ def main():
             if SHOW_WINDOW:
                 cv2.imshow(WINDOW_NAME, frame)
                 if cv2.waitKey(1) & 0xFF == ord('q'):
-                    send_bytes(cmd_sock, 0, 0, 0, PI_HOST, CMD_PORT)
+                    cmd_sock = send_bytes(cmd_sock, 0, 0, 0, PI_HOST, CMD_PORT, verbose=PRINT_CMD)
+                    if dlog is not None:
+                        t_now = time.time()
+                        dlog.log(0, src_fid, t_now, t_now, kind=KIND_QUIT)
                     break
 
     except KeyboardInterrupt:
@@ -257,6 +305,10 @@ def main():
     finally:
         try: video_sock.close()
         except: pass
+        if video_src is not None:
+            video_src.release()
+        if dlog is not None:
+            dlog.close()
         try: cmd_sock.close()
         except: pass
         cv2.destroyAllWindows()
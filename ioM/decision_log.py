@@ -0,0 +1,115 @@
+# ioM/decision_log.py (fixed-size binary per-frame log, ring buffer + background writer)
+# ไฟล์ = [header 16B][record][record]... อ่านกลับด้วย np.memmap ได้ทันที (ดู read_decision_log)
+import os, struct, threading
+import numpy as np
+
+MAGIC = b"PCDLOG03"
+HDR = struct.Struct("<8sII")                 # magic, record size, reserved
+HDR_SIZE = HDR.size
+
+# method จาก pick_best_target_fused -> รหัส 1 ไบต์
+METHODS = ("", "width", "H", "width_sanity")
+_METHOD_CODE = {m: i for i, m in enumerate(METHODS)}
+
+# ชนิดของ record: เฟรมปกติ / วิดีโอค้าง (ส่ง stop โดยไม่มีเฟรม) / กด q ออก
+KIND_FRAME, KIND_STALL, KIND_QUIT = 0, 1, 2
+KINDS = ("frame", "stall", "quit")
+
+RECORD_DTYPE = np.dtype([
+    ("kind",      "u1"),     # index ใน KINDS
+    ("frame_id",  "<u4"),    # ตัวนับเฟรมของ app (+1 ทุก record kind=frame); stall/quit = 0
+    ("src_fid",   "<u4"),    # frame_id จากผู้ส่ง (UDP) ใช้หาเฟรมวิดีโอที่หาย; TCP = frame_id; stall = id ล่าสุดที่รู้
+    ("t_recv",    "<f8"),    # time.time() ตอนได้เฟรม
+    ("t_send",    "<f8"),    # time.time() หลังส่งคำสั่ง
+    ("cls",       "<i2"),    # -1 = ไม่มีเป้า
+    ("x1",        "<i2"),
+    ("y1",        "<i2"),
+    ("x2",        "<i2"),
+    ("y2",        "<i2"),
+    ("dist_raw",  "<f4"),    # cm ก่อน Kalman (NaN ถ้าไม่มีเป้า)
+    ("dist_filt", "<f4"),    # cm หลัง Kalman
+    ("method",    "u1"),     # index ใน METHODS
+    ("angle",     "<f4"),    # deg
+    ("speed",     "u1"),     # %
+    ("state",     "u1"),     # 0 none, 1 bottle, 2 leaf
+])
+
+
+class DecisionLog:
+    def __init__(self, path, capacity=4096, block=256, flush_interval_s=1.0):
+        self.path = path
+        self.capacity = int(capacity)
+        self.block = max(1, min(int(block), self.capacity))
+        self.flush_interval_s = flush_interval_s
+        self._buf = np.zeros(self.capacity, dtype=RECORD_DTYPE)   # จองไว้ล่วงหน้า ไม่ allocate ต่อเฟรม
+        self._head = 0          # จำนวน record ที่เขียนเข้า ring ทั้งหมด
+        self._tail = 0          # จำนวน record ที่ลงไฟล์แล้ว
+        self.dropped = 0        # ring เต็ม (writer ตามไม่ทัน)
+        self._cond = threading.Condition()
+        self._closing = False
+
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._f = open(path, "wb")
+        self._f.write(HDR.pack(MAGIC, RECORD_DTYPE.itemsize, 0))
+        self._thread = threading.Thread(target=self._writer, name="decision-log", daemon=True)
+        self._thread.start()
+        print(f"[INFO] Decision log -> {path}")
+
+    def log(self, frame_id, src_fid, t_recv, t_send, cls=-1, xyxy=None, dist_raw=float("nan"),
+            dist_filt=float("nan"), method="", angle=0.0, speed=0, state=0, kind=KIND_FRAME):
+        x1, y1, x2, y2 = xyxy if xyxy is not None else (0, 0, 0, 0)
+        with self._cond:
+            if self._head - self._tail >= self.capacity:
+                self.dropped += 1
+                return
+            self._buf[self._head % self.capacity] = (
+                kind, frame_id & 0xFFFFFFFF, src_fid & 0xFFFFFFFF, t_recv, t_send, cls, x1, y1, x2, y2,
+                dist_raw, dist_filt, _METHOD_CODE.get(method, 0), angle, speed, state)
+            self._head += 1
+            if self._head - self._tail >= self.block:
+                self._cond.notify()
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                if not self._closing and self._head - self._tail < self.block:
+                    self._cond.wait(self.flush_interval_s)
+                head, tail, closing = self._head, self._tail, self._closing
+            if head > tail:
+                # slot [tail, head) ไม่ถูก producer แตะจนกว่า _tail จะขยับ -> เขียนนอก lock ได้
+                a, b = tail % self.capacity, head % self.capacity
+                if a < b:
+                    self._f.write(self._buf[a:b].tobytes())
+                else:
+                    self._f.write(self._buf[a:].tobytes())
+                    self._f.write(self._buf[:b].tobytes())
+                self._f.flush()
+                with self._cond:
+                    self._tail = head
+            elif closing:
+                return
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join()
+        self._f.close()
+        if self.dropped:
+            print(f"[WARN] Decision log dropped {self.dropped} records (ring full)")
+
+
+def read_decision_log(path):
+    """โหลดไฟล์ log เป็น structured array แบบ memmap (record ท้ายที่เขียนไม่ครบจะถูกตัดทิ้ง)"""
+    with open(path, "rb") as f:
+        magic, rec_size, _ = HDR.unpack(f.read(HDR_SIZE))
+    if magic != MAGIC:
+        raise ValueError(f"Not a decision log: {path}")
+    if rec_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Record size mismatch: file={rec_size} expected={RECORD_DTYPE.itemsize}")
+    n = (os.path.getsize(path) - HDR_SIZE) // rec_size
+    if n == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HDR_SIZE, shape=(n,))
@@ -0,0 +1,173 @@
+# ioM/udp_video_source.py (low-latency, drop late frames)
+# Datagram = [frame_id(4B)][frag_idx(2B)][frag_count(2B)][JPEG chunk] big-endian
+# ไม่มี retransmit: เฟรมที่ไม่ครบภายใน deadline จะถูกทิ้ง แทนที่จะค้างรอแบบ TCP
+import socket, struct, numpy as np, cv2, time
+
+FRAG_HDR = struct.Struct(">IHH")
+MAX_DATAGRAM = 1400                          # ให้ไม่เกิน MTU ของ Wi-Fi (ไม่แตก IP fragment)
+MAX_CHUNK = MAX_DATAGRAM - FRAG_HDR.size
+DEAD_IDS_KEEP = 64                           # จำ frame_id ที่ทิ้งไปแล้วกี่ตัว (กันนับซ้ำ)
+
+
+def fragment_jpeg(frame_id, payload, max_chunk=MAX_CHUNK):
+    """ตัด JPEG เป็น datagram หลายชิ้น พร้อม header (ใช้ฝั่งผู้ส่ง)"""
+    count = max(1, (len(payload) + max_chunk - 1) // max_chunk)
+    if count > 0xFFFF:
+        raise ValueError(f"frame too large: {len(payload)} bytes")
+    fid = frame_id & 0xFFFFFFFF
+    return [FRAG_HDR.pack(fid, i, count) + payload[i * max_chunk:(i + 1) * max_chunk]
+            for i in range(count)]
+
+
+class UDPVideoSource:
+    def __init__(self, bind_ip, port, frame_deadline_s=0.1, read_timeout_s=1.0,
+                 rcvbuf_bytes=1 << 20, stats_interval_s=5.0, resync_after_s=None):
+        self.bind_ip, self.port = bind_ip, port
+        self.frame_deadline_s = frame_deadline_s
+        self.read_timeout_s = read_timeout_s
+        self.stats_interval_s = stats_interval_s
+        # มีแต่ชิ้นเก่ามาต่อเนื่องนานเกินนี้ (ไม่มีเฟรมไหนครบเลย) = ผู้ส่งรีสตาร์ทนับ frame_id ใหม่
+        self.resync_after_s = 3 * frame_deadline_s if resync_after_s is None else resync_after_s
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf_bytes)
+        except OSError:
+            pass
+        self.sock.bind((bind_ip, port))
+        print(f"[INFO] Listening for UDP camera stream on {bind_ip}:{port}")
+
+        self._pending = {}       # frame_id -> [first_seen_t, frag_count, parts(list), received]
+        self._last_id = None     # frame_id ล่าสุดที่ประกอบครบแล้ว
+        self._last_done_t = None # เวลาที่ประกอบเฟรมครบล่าสุด
+        self._dead = {}          # frame_id ที่ทิ้งไปแล้ว (ใช้ dict เป็น ordered set)
+        self.last_frame_id = None  # frame_id (ของผู้ส่ง) ของเฟรมที่ read() คืนล่าสุด
+        self._last_stats_t = time.monotonic()
+        self.stats = {
+            "frames_ok": 0,          # เฟรมที่ decode แล้วส่งออก
+            "frames_dropped": 0,     # เฟรมไม่ครบ หมด deadline หรือมีเฟรมใหม่กว่ามาแทน
+            "frames_skipped": 0,     # เฟรมครบ แต่มีเฟรมใหม่กว่าครบก่อนจะถูกอ่าน
+            "frames_bad": 0,         # imdecode ไม่ผ่าน
+            "frags_late": 0,         # ชิ้นของเฟรมที่เก่ากว่าเฟรมล่าสุดที่ประกอบครบ หรือของเฟรมที่ทิ้งไปแล้ว
+            "frags_bad": 0,          # header เพี้ยน
+        }
+
+    # ---------- reassembly ----------
+    def _is_newer(self, a, b):
+        """เทียบ frame_id แบบ wrap-around (serial number arithmetic)"""
+        return b is None or 0 < ((a - b) & 0xFFFFFFFF) < 0x80000000
+
+    def _drop(self, fid):
+        del self._pending[fid]
+        self.stats["frames_dropped"] += 1
+        # จำไว้ ชิ้นที่มาช้าของเฟรมนี้จะได้ไม่เปิด pending ใหม่แล้วถูกนับ drop ซ้ำ
+        self._dead[fid] = None
+        if len(self._dead) > DEAD_IDS_KEEP:
+            del self._dead[next(iter(self._dead))]
+
+    def _expire(self, now):
+        for fid in [f for f, p in self._pending.items() if now - p[0] > self.frame_deadline_s]:
+            self._drop(fid)
+
+    def _feed(self, data, now):
+        """รับ datagram หนึ่งชิ้น; คืน (frame_id, payload) ถ้าเฟรมครบ ไม่งั้นคืน None"""
+        if len(data) < FRAG_HDR.size:
+            self.stats["frags_bad"] += 1
+            return None
+        fid, idx, count = FRAG_HDR.unpack_from(data)
+        if count == 0 or idx >= count:
+            self.stats["frags_bad"] += 1
+            return None
+        if not self._is_newer(fid, self._last_id):
+            if now - self._last_done_t <= self.resync_after_s:
+                self.stats["frags_late"] += 1
+                return None
+            # ได้แต่ชิ้น "เก่า" มาสักพักแล้ว ไม่มีเฟรมครบ = ผู้ส่งรีสตาร์ท -> เริ่มนับใหม่
+            print("[UDP] only stale frame_ids for a while (sender restarted?), resync")
+            self._pending.clear()
+            self._dead.clear()
+            self._last_id = None
+        elif fid in self._dead:
+            self.stats["frags_late"] += 1
+            return None
+
+        p = self._pending.get(fid)
+        if p is None:
+            p = self._pending[fid] = [now, count, [None] * count, 0]
+        elif p[1] != count:
+            self.stats["frags_bad"] += 1
+            return None
+        if p[2][idx] is None:
+            p[2][idx] = data[FRAG_HDR.size:]
+            p[3] += 1
+        if p[3] < count:
+            return None
+
+        del self._pending[fid]
+        self._last_id = fid
+        self._last_done_t = now
+        # เฟรมครบแล้ว -> เฟรมที่เก่ากว่าซึ่งยังค้างอยู่ไม่มีประโยชน์อีก
+        for old in [f for f in self._pending if not self._is_newer(f, fid)]:
+            self._drop(old)
+        return fid, b"".join(p[2])
+
+    def _recv_complete(self, blocking_deadline):
+        """วนรับจนได้เฟรมครบหนึ่งเฟรม หรือถึง deadline (None ถ้าไม่มี)"""
+        while True:
+            now = time.monotonic()
+            self._expire(now)
+            if blocking_deadline is None:
+                self.sock.settimeout(0.0)
+            else:
+                remaining = blocking_deadline - now
+                if remaining <= 0:
+                    return None
+                self.sock.settimeout(remaining)
+            try:
+                data, _ = self.sock.recvfrom(65535)
+            except (socket.timeout, BlockingIOError):
+                return None
+            except OSError as e:
+                print(f"[UDP] recv error: {e}")
+                return None
+            done = self._feed(data, time.monotonic())
+            if done is not None:
+                return done
+
+    def _maybe_print_stats(self):
+        if self.stats_interval_s <= 0:
+            return
+        now = time.monotonic()
+        if now - self._last_stats_t >= self.stats_interval_s:
+            self._last_stats_t = now
+            s = self.stats
+            print(f"[UDP] ok={s['frames_ok']} dropped={s['frames_dropped']} skipped={s['frames_skipped']} "
+                  f"bad={s['frames_bad']} late_frags={s['frags_late']} bad_frags={s['frags_bad']}")
+
+    def read(self):
+        done = self._recv_complete(time.monotonic() + self.read_timeout_s)
+        if done is None:
+            self._maybe_print_stats()
+            return None  # ให้ loop ฝั่ง app.py ข้ามเฟรมนี้ไป
+
+        # ดูดที่ค้างใน buffer ออกให้หมด แล้วเลือกเฟรมใหม่สุด (ไม่ประมวลผลเฟรมเก่าเป็น backlog)
+        while True:
+            newer = self._recv_complete(None)
+            if newer is None:
+                break
+            self.stats["frames_skipped"] += 1
+            done = newer
+
+        fid, payload = done
+        self.last_frame_id = fid
+        self._maybe_print_stats()
+        frame = cv2.imdecode(np.frombuffer(payload, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            self.stats["frames_bad"] += 1
+            return None
+        self.stats["frames_ok"] += 1
+        return frame
+
+    def release(self):
+        try: self.sock.close()
+        except: pass
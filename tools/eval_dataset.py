@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# tools/eval_dataset.py
+# Offline batch evaluation of a model (best.pt) + distance fusion over dataset sessions from tools/cap.py
+#   python tools/eval_dataset.py dataset_session [more_sessions ...] [--model new.pt] [--device cpu] [--csv out.csv]
+# ใช้ config.yaml ชุดเดียวกับ app.py (classes, geometry, homography, detector) และ pick_best_target_fused ตัวเดียวกัน
+
+import sys, os, time, csv, pathlib, argparse
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import cv2
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai_core.postprocess import pick_best_target_fused
+
+LABEL_DIRS = ("raw", "bottle", "leaf")
+IMG_EXTS = (".jpg", ".jpeg", ".png")
+
+
+# ============ Dataset ============
+def list_session(session):
+    """คืน ([(path, label)], Counter(label -> ไฟล์ใน labels.csv ที่หายไป))
+    จาก labels.csv ถ้ามี ไม่งั้นสแกนโฟลเดอร์ raw/ bottle/ leaf/"""
+    base = pathlib.Path(session)
+    items = []
+    missing = Counter()
+    csv_path = base / "labels.csv"
+    if csv_path.exists():
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                p = base / row["filename"]
+                if p.exists():
+                    items.append((str(p), row["class"]))
+                else:
+                    print(f"[WARN] Missing {p} (listed in {csv_path})")
+                    missing[row["class"]] += 1
+    else:
+        for label in LABEL_DIRS:
+            d = base / label
+            if d.is_dir():
+                items += [(str(p), label) for p in sorted(d.iterdir()) if p.suffix.lower() in IMG_EXTS]
+    return items, missing
+
+
+def prefetch_batches(items, batch_size, workers, prefetch=2):
+    """decode รูปแบบขนานด้วย thread pool (cv2.imread ปล่อย GIL) และเตรียมล่วงหน้า `prefetch` batch
+    ระหว่างที่ detector กำลังรัน batch ปัจจุบัน; yield (items_chunk, images, decode_wait_s)"""
+    starts = iter(range(0, len(items), batch_size))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending = deque()
+
+        def submit_next():
+            s = next(starts, None)
+            if s is None:
+                return False
+            chunk = items[s:s + batch_size]
+            pending.append((chunk, [ex.submit(cv2.imread, p) for p, _ in chunk]))
+            return True
+
+        for _ in range(prefetch + 1):
+            if not submit_next():
+                break
+        while pending:
+            chunk, futs = pending.popleft()
+            t0 = time.perf_counter()
+            imgs = [f.result() for f in futs]
+            wait_s = time.perf_counter() - t0
+            submit_next()
+            yield chunk, imgs, wait_s
+
+
+# ============ Main ============
+def main():
+    ap = argparse.ArgumentParser(description="Batch-evaluate detector + distance fusion on captured sessions")
+    ap.add_argument("sessions", nargs="+", help="dataset session dirs (from tools/cap.py)")
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--model", default=None, help="override config.yaml model")
+    ap.add_argument("--device", default="cpu")
+    ap.add_argument("--batch", type=int, default=16)
+    ap.add_argument("--workers", type=int, default=max(2, (os.cpu_count() or 4) // 2))
+    ap.add_argument("--csv", default=None, help="write per-image results")
+    args = ap.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        CFG = yaml.safe_load(f)
+
+    items = []
+    missing = Counter()
+    for s in args.sessions:
+        sess_items, sess_missing = list_session(s)
+        items += sess_items
+        missing += sess_missing
+    if not items:
+        print("[WARN] No images found" + (f" (missing from labels.csv: {dict(missing)})" if missing else ""))
+        return
+    print(f"[INFO] {len(items)} images from {len(args.sessions)} session(s)")
+
+    # --- Model ---
+    from ultralytics import YOLO
+    model_path = args.model or CFG["model"]
+    det_cfg = CFG["detector"]
+    model = YOLO(model_path)
+    print(f"[INFO] Model {model_path} on {args.device}")
+
+    # --- Geometry / Homography (เหมือน app.py) ---
+    geom = CFG["geometry"]
+    H = None
+    if CFG.get("homography", {}).get("use", False):
+        H_path = CFG["homography"].get("file", "tools/H.npy")
+        try:
+            H = np.load(H_path)
+            print(f"[INFO] Loaded H from {H_path}")
+        except Exception as e:
+            print(f"[WARN] Can't load H: {e}")
+
+    bottle_id = CFG["classes"]["bottle"]
+    leaf_id = CFG["classes"]["leaf"]
+    id_to_name = {bottle_id: "bottle", leaf_id: "leaf"}
+
+    per_label = {lab: Counter() for lab in LABEL_DIRS}
+    for lab, k in missing.items():
+        per_label.setdefault(lab, Counter())["missing"] = k
+    methods = Counter()
+    dists = {"bottle": [], "leaf": []}
+    rows = []
+    decode_wait = infer_s = 0.0
+    n_done = 0
+
+    t_start = time.perf_counter()
+    for chunk, imgs, wait_s in prefetch_batches(items, args.batch, args.workers):
+        decode_wait += wait_s
+        ok = [(it, im) for it, im in zip(chunk, imgs) if im is not None]
+        for it, im in zip(chunk, imgs):
+            if im is None:
+                print(f"[WARN] Can't read {it[0]}")
+                per_label.setdefault(it[1], Counter())["unreadable"] += 1
+        if not ok:
+            continue
+
+        t0 = time.perf_counter()
+        # เรียกแบบเดียวกับ app.py (imgsz + conf เท่านั้น, NMS iou ใช้ค่า default ของ ultralytics)
+        results = model([im for _, im in ok], imgsz=det_cfg["imgsz"], conf=det_cfg["conf"],
+                        device=args.device, verbose=False)
+        infer_s += time.perf_counter() - t0
+
+        for ((path, label), im), r in zip(ok, results):
+            Hh, Ww = im.shape[:2]
+            dets = [{"cls": int(b.cls[0]), "xyxy": tuple(map(int, b.xyxy[0]))} for b in r.boxes]
+            best = pick_best_target_fused(
+                dets,
+                allowed_classes={bottle_id, leaf_id},
+                frame_w=Ww,
+                frame_h=Hh,
+                H_or_None=H,
+                real_w_cm=geom["real_object_width_cm"],
+                focal_px=geom["focal_length_px"],
+                h_fov_deg=geom["h_fov_deg"]
+            )
+            c = per_label.setdefault(label, Counter())
+            c["n"] += 1
+            pred = id_to_name.get(best["cls"]) if best else None
+            if best is None:
+                c["no_target"] += 1
+            else:
+                c["pred_" + pred] += 1
+                methods[best["method"]] += 1
+                dists[pred].append(best["distance_cm"])
+                if pred == label:
+                    c["hit"] += 1
+            if args.csv:
+                rows.append([path, label, pred or "", len(dets),
+                             f"{best['distance_cm']:.1f}" if best else "",
+                             best["method"] if best else "",
+                             f"{best['angle_deg']:.1f}" if best else ""])
+        n_done += len(ok)
+        el = time.perf_counter() - t_start
+        print(f"\r[EVAL] {n_done}/{len(items)}  {n_done / el:.1f} img/s", end="", flush=True)
+    total_s = time.perf_counter() - t_start
+    print()
+
+    # --- Report ---
+    print("\n=== Per-class (label = folder; n / rates count readable images only) ===")
+    for label, c in per_label.items():
+        if not c["n"] and not c["unreadable"] and not c["missing"]:
+            continue
+        line = f"{label:7s} n={c['n']:5d}  bottle={c['pred_bottle']:5d}  leaf={c['pred_leaf']:5d}  none={c['no_target']:5d}"
+        if not c["n"]:
+            line += "  (no readable images)"
+        elif label in dists:
+            line += f"  hit_rate={c['hit'] / c['n']:.1%}"
+        else:
+            line += f"  detect_rate={(c['n'] - c['no_target']) / c['n']:.1%}"
+        if c["unreadable"]:
+            line += f"  unreadable={c['unreadable']}"
+        if c["missing"]:
+            line += f"  missing={c['missing']}"
+        print(line)
+
+    print("\n=== Distance method mix ===")
+    n_best = sum(methods.values())
+    for m in ("width", "H", "width_sanity"):
+        print(f"{m:12s} {methods[m]:6d}  {methods[m] / n_best if n_best else 0:.1%}")
+    for name, v in dists.items():
+        if v:
+            a = np.asarray(v)
+            print(f"{name:7s} distance cm: median {np.median(a):.1f}  p5 {np.percentile(a, 5):.1f}  p95 {np.percentile(a, 95):.1f}")
+
+    print("\n=== Throughput ===")
+    print(f"images      : {n_done} in {total_s:.1f}s  -> {n_done / total_s if total_s > 0 else 0:.1f} img/s")
+    print(f"inference   : {infer_s:.1f}s   decode wait: {decode_wait:.1f}s (batch={args.batch}, workers={args.workers})")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["filename", "label", "pred", "n_dets", "distance_cm", "method", "angle_deg"])
+            w.writerows(rows)
+        print(f"[SAVE] {args.csv}")
+
+if __name__ == "__main__":
+    main()
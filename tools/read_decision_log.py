@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# tools/read_decision_log.py
+# Load a binary decision log (runtime.decision_log) into NumPy arrays and print a summary
+#   python tools/read_decision_log.py logs/decision_xxx.bin [out.csv]
+#   หรือใน notebook:  from tools.read_decision_log import load_log; d = load_log(path); d["dist_filt"]
+
+import sys, os
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ioM.decision_log import read_decision_log, METHODS, KINDS, KIND_FRAME
+
+
+def load_log(path):
+    """คืน dict: ชื่อ field -> np.ndarray (คอลัมน์ละ array) + 'method_name', 'kind_name'"""
+    rec = read_decision_log(path)
+    d = {name: np.asarray(rec[name]) for name in rec.dtype.names}
+    d["method_name"] = np.array(METHODS, dtype=object)[d["method"]] if len(rec) else np.zeros(0, dtype=object)
+    d["kind_name"] = np.array(KINDS, dtype=object)[d["kind"]] if len(rec) else np.zeros(0, dtype=object)
+    return d
+
+
+def summarize(d):
+    print(f"records      : {len(d['frame_id'])}  (" +
+          "  ".join(f"{k}={int(np.sum(d['kind'] == i))}" for i, k in enumerate(KINDS)) + ")")
+    # สถิติต่อเฟรมใช้เฉพาะ record kind=frame (stall/quit ไม่ใช่เฟรมวิดีโอ)
+    d = {k: v[d["kind"] == KIND_FRAME] for k, v in d.items()}
+    n = len(d["frame_id"])
+    if n == 0:
+        return
+    dur = float(d["t_recv"][-1] - d["t_recv"][0])
+    print(f"duration     : {dur:.1f}s  ({(n - 1) / dur if dur > 0 else 0:.1f} frames/s)")
+    # frame_id เป็นตัวนับของ app -> ช่องว่าง = record หายเพราะ ring เต็ม
+    rec_gaps = np.diff(d["frame_id"].astype(np.int64)) - 1
+    print(f"log records dropped : {int(np.sum(rec_gaps[rec_gaps > 0]))}")
+    # src_fid จากผู้ส่ง (UDP) -> ช่องว่าง = เฟรมวิดีโอที่หาย/ถูกข้าม; รีสตาร์ทผู้ส่ง (ถอยหลัง) ไม่นับ
+    vid_gaps = np.diff(d["src_fid"].astype(np.int64)) - 1
+    vid_gaps = vid_gaps[vid_gaps > 0]
+    print(f"video frames missing: {int(vid_gaps.sum())} in {len(vid_gaps)} gaps (largest {int(vid_gaps.max()) if len(vid_gaps) else 0})")
+    lat_ms = (d["t_send"] - d["t_recv"]) * 1000.0
+    print(f"recv->send   : mean {lat_ms.mean():.1f}ms  p95 {np.percentile(lat_ms, 95):.1f}ms  max {lat_ms.max():.1f}ms")
+    for s, name in ((0, "none"), (1, "bottle"), (2, "leaf")):
+        print(f"state {name:6s} : {int(np.sum(d['state'] == s))}")
+    has = d["cls"] >= 0
+    for i, m in enumerate(METHODS[1:], start=1):
+        print(f"method {m:12s}: {int(np.sum(d['method'][has] == i))}")
+    if has.any():
+        diff = np.abs(d["dist_raw"][has] - d["dist_filt"][has])
+        print(f"|raw-filt| cm: mean {diff.mean():.1f}  max {diff.max():.1f}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: python tools/read_decision_log.py LOG.bin [out.csv]")
+        sys.exit(1)
+    d = load_log(sys.argv[1])
+    summarize(d)
+    if len(sys.argv) > 2:
+        cols = [k for k in d if k != "method"]
+        with open(sys.argv[2], "w", encoding="utf-8") as f:
+            f.write(",".join(cols) + "\n")
+            for i in range(len(d["frame_id"])):
+                f.write(",".join(str(d[k][i]) for k in cols) + "\n")
+        print(f"[SAVE] {sys.argv[2]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# tools/udp_video_sender.py
+# Local test sender for ioM/udp_video_source.py: webcam / image folder -> JPEG -> UDP fragments
+
+import sys, os, time, random, pathlib
+import socket
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ioM.udp_video_source import fragment_jpeg
+
+# ============================================
+# 🔧 CONFIG (ตั้งค่าได้ตรงนี้)
+DEST_IP = "127.0.0.1"       # ✅ IP ของ PC ที่รัน app.py (video_transport: "udp")
+VIDEO_PORT = 6000           # ✅ ต้องตรงกับ network.video_port
+SOURCE = 0                  # 0 = webcam, หรือ path โฟลเดอร์รูป เช่น "dataset_session/raw"
+FPS = 15.0
+JPEG_QUALITY = 80
+LOSS_RATE = 0.0             # จำลอง packet loss (0.02 = ทิ้ง 2% ของ datagram)
+REORDER = False             # จำลองการสลับลำดับ datagram ภายในเฟรม
+# ============================================
+
+
+def frames_from_source(src):
+    if isinstance(src, int):
+        cap = cv2.VideoCapture(src)
+        if not cap.isOpened():
+            raise RuntimeError(f"Cannot open camera {src}")
+        try:
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    return
+                yield frame
+        finally:
+            cap.release()
+    else:
+        paths = sorted(p for p in pathlib.Path(src).iterdir()
+                       if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+        if not paths:
+            raise RuntimeError(f"No images in {src}")
+        while True:  # วนซ้ำไปเรื่อย ๆ
+            for p in paths:
+                frame = cv2.imread(str(p))
+                if frame is not None:
+                    yield frame
+
+
+def main():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    dest = (DEST_IP, VIDEO_PORT)
+    print(f"[INFO] Sending UDP video to {DEST_IP}:{VIDEO_PORT} (loss={LOSS_RATE:.0%}, reorder={REORDER})")
+
+    period = 1.0 / FPS
+    frame_id = 0
+    sent_frames = sent_frags = lost_frags = 0
+    t_next = time.monotonic()
+    t_report = time.monotonic()
+
+    try:
+        for frame in frames_from_source(SOURCE):
+            ok, jpg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+            if not ok:
+                continue
+            frags = fragment_jpeg(frame_id, jpg.tobytes())
+            if REORDER:
+                random.shuffle(frags)
+            for d in frags:
+                if LOSS_RATE > 0 and random.random() < LOSS_RATE:
+                    lost_frags += 1
+                    continue
+                sock.sendto(d, dest)
+                sent_frags += 1
+            frame_id = (frame_id + 1) & 0xFFFFFFFF
+            sent_frames += 1
+
+            now = time.monotonic()
+            if now - t_report >= 5.0:
+                print(f"[UDP-TX] frames={sent_frames} frags={sent_frags} simulated_lost={lost_frags}")
+                t_report = now
+
+            t_next += period
+            delay = t_next - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                t_next = time.monotonic()  # ช้ากว่ากำหนด -> ไม่ต้องเร่งตามทัน
+
+    except KeyboardInterrupt:
+        print("\n[INFO] KeyboardInterrupt")
+    finally:
+        sock.close()
+        print("[INFO] Exit UDP sender")
+
+if __name__ == "__main__":
+    main()